@@ -16,6 +16,18 @@ from docker.errors import APIError
 from docker.models.containers import Container
 
 
+# Command fragments refused by DockerSession._sanitize_command
+_RISKY_COMMANDS = (
+    "rm -rf /",
+    "rm -rf /*",
+    "mkfs",
+    "dd if=/dev/zero",
+    ":(){:|:&};:",
+    "chmod -R 777 /",
+    "chown -R",
+)
+
+
 class DockerSession:
     def __init__(self, container_id: str) -> None:
         """Initializes a Docker session.
@@ -123,12 +135,18 @@ class DockerSession:
         Raises:
             socket.error: If socket communication fails.
         """
-        buffer = b""
-        while b"$ " not in buffer:
+        buffer = bytearray()
+        # Grow in place and only scan the newly received bytes (plus one, for
+        # a prompt split across chunks), rather than copying and rescanning
+        # the whole output on every recv.
+        while True:
             try:
                 chunk = self.socket.recv(4096)
                 if chunk:
+                    start = max(len(buffer) - 1, 0)
                     buffer += chunk
+                    if buffer.find(b"$ ", start) != -1:
+                        break
             except socket.error as e:
                 if e.errno == socket.EWOULDBLOCK:
                     await asyncio.sleep(0.1)
@@ -227,20 +245,10 @@ class DockerSession:
         Raises:
             ValueError: If command contains potentially dangerous patterns.
         """
-
         # Additional checks for specific risky commands
-        risky_commands = [
-            "rm -rf /",
-            "rm -rf /*",
-            "mkfs",
-            "dd if=/dev/zero",
-            ":(){:|:&};:",
-            "chmod -R 777 /",
-            "chown -R",
-        ]
-
-        for risky in risky_commands:
-            if risky in command.lower():
+        lowered = command.lower()
+        for risky in _RISKY_COMMANDS:
+            if risky in lowered:
                 raise ValueError(
                     f"Command contains potentially dangerous operation: {risky}"
                 )
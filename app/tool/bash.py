@@ -12,6 +12,12 @@ _BASH_DESCRIPTION = """Execute a bash command in the terminal.
 * Timeout: If a command execution result says "Command timed out. Sending SIGINT to the process", the assistant should retry running the command in the background.
 """
 
+# StreamReader buffer limit for the shell's pipes. A reader stops reading
+# its pipe once its buffer holds twice the limit; the buffers are emptied on
+# every poll, and a larger limit lets a chatty command fill more of one poll
+# interval before the pipe is paused.
+_STREAM_LIMIT = 1 << 19
+
 
 class _BashSession:
     """A session of a bash shell."""
@@ -37,6 +43,7 @@ class _BashSession:
             preexec_fn=os.setsid,
             shell=True,
             bufsize=0,
+            limit=_STREAM_LIMIT,
             stdin=asyncio.subprocess.PIPE,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
@@ -78,19 +85,24 @@ class _BashSession:
         await self._process.stdin.drain()
 
         # read output from the process, until the sentinel is found
+        sentinel = self._sentinel.encode()
+        stdout, stderr = bytearray(), bytearray()
+        searched = 0
         try:
             async with asyncio.timeout(self._timeout):
                 while True:
                     await asyncio.sleep(self._output_delay)
                     # if we read directly from stdout/stderr, it will wait forever for
-                    # EOF. use the StreamReader buffer directly instead.
-                    output = (
-                        self._process.stdout._buffer.decode()
-                    )  # pyright: ignore[reportAttributeAccessIssue]
-                    if self._sentinel in output:
-                        # strip the sentinel and break
-                        output = output[: output.index(self._sentinel)]
+                    # EOF. use the StreamReader buffers directly instead.
+                    self._take_buffered(self._process.stdout, stdout)
+                    self._take_buffered(self._process.stderr, stderr)
+                    # look for the sentinel in the raw bytes, only in what
+                    # arrived since the last poll, and decode once at the end
+                    end = stdout.find(sentinel, searched)
+                    if end != -1:
+                        output = stdout[:end].decode(errors="replace")
                         break
+                    searched = max(len(stdout) - len(sentinel) + 1, 0)
         except asyncio.TimeoutError:
             self._timed_out = True
             raise ToolError(
@@ -100,18 +112,29 @@ class _BashSession:
         if output.endswith("\n"):
             output = output[:-1]
 
-        error = (
-            self._process.stderr._buffer.decode()
-        )  # pyright: ignore[reportAttributeAccessIssue]
+        # take what is left, so that the next output can be read correctly
+        self._take_buffered(self._process.stdout, bytearray())
+        self._take_buffered(self._process.stderr, stderr)
+        error = stderr.decode(errors="replace")
         if error.endswith("\n"):
             error = error[:-1]
 
-        # clear the buffers so that the next output can be read correctly
-        self._process.stdout._buffer.clear()  # pyright: ignore[reportAttributeAccessIssue]
-        self._process.stderr._buffer.clear()  # pyright: ignore[reportAttributeAccessIssue]
-
         return CLIResult(output=output, error=error)
 
+    @staticmethod
+    def _take_buffered(reader: asyncio.StreamReader, into: bytearray) -> None:
+        """Move a reader's buffered bytes into `into` without awaiting EOF.
+
+        The buffer is emptied behind the reader's back, so it is told to
+        resume reading the pipe in case it paused on a full buffer; otherwise
+        a command printing more than twice the limit would stall.
+        """
+        buffer = reader._buffer  # pyright: ignore[reportAttributeAccessIssue]
+        if buffer:
+            into += buffer
+            buffer.clear()
+            reader._maybe_resume_transport()  # pyright: ignore[reportAttributeAccessIssue]
+
 
 class Bash(BaseTool):
     """A tool for executing bash commands"""
@@ -16,7 +16,63 @@ from app.tool.base import BaseTool, ToolResult
 from app.tool.web_search import WebSearch
 
 
-_BROWSER_DESCRIPTION = """\
+# Single source of truth for the supported actions: the description's action
+# list, the ``action`` enum and the ``dependencies`` table are derived from it.
+_BROWSER_ACTIONS: dict[str, dict] = {
+    "go_to_url": {"required": ("url",), "desc": "Go to a specific URL"},
+    "click_element": {
+        "required": ("index",),
+        "desc": "Click an element by index",
+    },
+    "input_text": {
+        "required": ("index", "text"),
+        "desc": "Input text into an element",
+    },
+    "scroll_down": {
+        "required": ("scroll_amount",),
+        "desc": "Scroll down the page by pixel amount",
+    },
+    "scroll_up": {
+        "required": ("scroll_amount",),
+        "desc": "Scroll up the page by pixel amount",
+    },
+    "scroll_to_text": {
+        "required": ("text",),
+        "desc": "Scroll to the first element containing the text",
+    },
+    "send_keys": {
+        "required": ("keys",),
+        "desc": "Send keyboard keys to the current page",
+    },
+    "get_dropdown_options": {
+        "required": ("index",),
+        "desc": "Get all options from a dropdown",
+    },
+    "select_dropdown_option": {
+        "required": ("index", "text"),
+        "desc": "Select a dropdown option by its text",
+    },
+    "go_back": {"required": (), "desc": "Go back to the previous page"},
+    "refresh": {"required": (), "desc": "Refresh the current page"},
+    "web_search": {
+        "required": ("query",),
+        "desc": "Search the web and open the first result",
+    },
+    "wait": {"required": ("seconds",), "desc": "Wait for a number of seconds"},
+    "extract_content": {
+        "required": ("goal",),
+        "desc": "Extract page content relevant to a goal",
+    },
+    "switch_tab": {"required": ("tab_id",), "desc": "Switch to a specific tab"},
+    "open_tab": {"required": ("url",), "desc": "Open a new tab with a URL"},
+    "close_tab": {"required": (), "desc": "Close the current tab"},
+}
+
+_BROWSER_ACTIONS_HELP = "\n".join(
+    f"- '{name}': {spec['desc']}" for name, spec in _BROWSER_ACTIONS.items()
+)
+
+_BROWSER_DESCRIPTION = f"""\
 A powerful browser automation tool that allows interaction with web pages through various actions.
 * This tool provides commands for controlling a browser session, navigating web pages, and extracting information
 * It maintains state across calls, keeping the browser session alive until explicitly closed
@@ -30,96 +86,84 @@ Key capabilities include:
 * Content extraction: Extract and analyze content from web pages based on specific goals
 * Tab management: Switch between tabs, open new tabs, or close tabs
 
+Available actions:
+{_BROWSER_ACTIONS_HELP}
+
 Note: When using element indices, refer to the numbered elements shown in the current browser state.
 """
 
+_BROWSER_PARAMETERS: dict = {
+    "type": "object",
+    "properties": {
+        "action": {
+            "type": "string",
+            "enum": list(_BROWSER_ACTIONS),
+            "description": "The browser action to perform",
+        },
+        "url": {
+            "type": "string",
+            "description": "URL for 'go_to_url' or 'open_tab' actions",
+        },
+        "index": {
+            "type": "integer",
+            "description": "Element index for 'click_element', 'input_text', 'get_dropdown_options', or 'select_dropdown_option' actions",
+        },
+        "text": {
+            "type": "string",
+            "description": "Text for 'input_text', 'scroll_to_text', or 'select_dropdown_option' actions",
+        },
+        "scroll_amount": {
+            "type": "integer",
+            "description": "Pixels to scroll (positive for down, negative for up) for 'scroll_down' or 'scroll_up' actions",
+        },
+        "tab_id": {
+            "type": "integer",
+            "description": "Tab ID for 'switch_tab' action",
+        },
+        "query": {
+            "type": "string",
+            "description": "Search query for 'web_search' action",
+        },
+        "goal": {
+            "type": "string",
+            "description": "Extraction goal for 'extract_content' action",
+        },
+        "keys": {
+            "type": "string",
+            "description": "Keys to send for 'send_keys' action",
+        },
+        "seconds": {
+            "type": "integer",
+            "description": "Seconds to wait for 'wait' action",
+        },
+    },
+    "required": ["action"],
+    "dependencies": {
+        name: list(spec["required"])
+        for name, spec in _BROWSER_ACTIONS.items()
+        if spec["required"]
+    },
+}
+
+# Constant source so V8 can reuse its compilation; the offset is passed as an
+# argument instead of being interpolated into the script.
+_SCROLL_BY_JS = "(dy) => window.scrollBy(0, dy)"
+
 Context = TypeVar("Context")
 
 
+def _json_default(obj):
+    """Serialize pydantic models (e.g. tabs) lazily while encoding state."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 class BrowserUseTool(BaseTool, Generic[Context]):
     name: str = "browser_use"
     description: str = _BROWSER_DESCRIPTION
-    parameters: dict = {
-        "type": "object",
-        "properties": {
-            "action": {
-                "type": "string",
-                "enum": [
-                    "go_to_url",
-                    "click_element",
-                    "input_text",
-                    "scroll_down",
-                    "scroll_up",
-                    "scroll_to_text",
-                    "send_keys",
-                    "get_dropdown_options",
-                    "select_dropdown_option",
-                    "go_back",
-                    "web_search",
-                    "wait",
-                    "extract_content",
-                    "switch_tab",
-                    "open_tab",
-                    "close_tab",
-                ],
-                "description": "The browser action to perform",
-            },
-            "url": {
-                "type": "string",
-                "description": "URL for 'go_to_url' or 'open_tab' actions",
-            },
-            "index": {
-                "type": "integer",
-                "description": "Element index for 'click_element', 'input_text', 'get_dropdown_options', or 'select_dropdown_option' actions",
-            },
-            "text": {
-                "type": "string",
-                "description": "Text for 'input_text', 'scroll_to_text', or 'select_dropdown_option' actions",
-            },
-            "scroll_amount": {
-                "type": "integer",
-                "description": "Pixels to scroll (positive for down, negative for up) for 'scroll_down' or 'scroll_up' actions",
-            },
-            "tab_id": {
-                "type": "integer",
-                "description": "Tab ID for 'switch_tab' action",
-            },
-            "query": {
-                "type": "string",
-                "description": "Search query for 'web_search' action",
-            },
-            "goal": {
-                "type": "string",
-                "description": "Extraction goal for 'extract_content' action",
-            },
-            "keys": {
-                "type": "string",
-                "description": "Keys to send for 'send_keys' action",
-            },
-            "seconds": {
-                "type": "integer",
-                "description": "Seconds to wait for 'wait' action",
-            },
-        },
-        "required": ["action"],
-        "dependencies": {
-            "go_to_url": ["url"],
-            "click_element": ["index"],
-            "input_text": ["index", "text"],
-            "switch_tab": ["tab_id"],
-            "open_tab": ["url"],
-            "scroll_down": ["scroll_amount"],
-            "scroll_up": ["scroll_amount"],
-            "scroll_to_text": ["text"],
-            "send_keys": ["keys"],
-            "get_dropdown_options": ["index"],
-            "select_dropdown_option": ["index", "text"],
-            "go_back": [],
-            "web_search": ["query"],
-            "wait": ["seconds"],
-            "extract_content": ["goal"],
-        },
-    }
+    # Shared read-only schema; avoids deep-copying the default per instance.
+    parameters: dict = Field(default_factory=lambda: _BROWSER_PARAMETERS)
 
     lock: asyncio.Lock = Field(default_factory=asyncio.Lock)
     browser: Optional[BrowserUseBrowser] = Field(default=None, exclude=True)
@@ -302,9 +346,8 @@ class BrowserUseTool(BaseTool, Generic[Context]):
                         if scroll_amount is not None
                         else context.config.browser_window_size["height"]
                     )
-                    await context.execute_javascript(
-                        f"window.scrollBy(0, {direction * amount});"
-                    )
+                    page = await context.get_current_page()
+                    await page.evaluate(_SCROLL_BY_JS, direction * int(amount))
                     return ToolResult(
                         output=f"Scrolled {'down' if direction > 0 else 'up'} by {amount} pixels"
                     )
@@ -514,7 +557,7 @@ Page content:
             state_info = {
                 "url": state.url,
                 "title": state.title,
-                "tabs": [tab.model_dump() for tab in state.tabs],
+                "tabs": state.tabs,
                 "help": "[0], [1], [2], etc., represent clickable indices corresponding to the elements listed. Clicking on these indices will navigate to or interact with the respective content behind them.",
                 "interactive_elements": (
                     state.element_tree.clickable_elements_to_string()
@@ -532,7 +575,12 @@ Page content:
             }
 
             return ToolResult(
-                output=json.dumps(state_info, indent=4, ensure_ascii=False),
+                output=json.dumps(
+                    state_info,
+                    indent=4,
+                    ensure_ascii=False,
+                    default=_json_default,
+                ),
                 base64_image=screenshot,
             )
         except Exception as e:
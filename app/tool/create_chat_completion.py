@@ -1,4 +1,4 @@
-from typing import Any, List, Optional, Type, Union, get_args, get_origin
+from typing import Any, ClassVar, List, Optional, Type, Union, get_args, get_origin
 
 from pydantic import BaseModel, Field
 
@@ -12,7 +12,7 @@ class CreateChatCompletion(BaseTool):
     )
 
     # Type mapping for JSON schema
-    type_mapping: dict = {
+    type_mapping: ClassVar[dict] = {
         str: "string",
         int: "integer",
         float: "number",
@@ -1,8 +1,14 @@
 """File operation interfaces and implementations for local and sandbox environments."""
 
 import asyncio
+import contextlib
+import functools
+import os
+import shutil
+import signal
+import stat
 from pathlib import Path
-from typing import Optional, Protocol, Tuple, Union, runtime_checkable
+from typing import Dict, List, Optional, Protocol, Tuple, Union, runtime_checkable
 
 from app.config import SandboxSettings
 from app.exceptions import ToolError
@@ -11,6 +17,51 @@ from app.sandbox.client import SANDBOX_CLIENT
 
 PathLike = Union[str, Path]
 
+# Per-stream cap on captured command output; anything beyond it is read and
+# discarded so a chatty command cannot grow the agent's memory without bound.
+_MAX_COMMAND_OUTPUT = 1 << 20
+_OUTPUT_TRUNCATED = b"\n<output truncated>"
+_READ_CHUNK = 1 << 16
+
+# Number of recently read or written files whose content LocalFileOperator
+# keeps, so back-to-back view/edit calls on a file skip re-reading it.
+_READ_CACHE_SIZE = 32
+
+# Characters that need a shell to interpret; commands without any of them are
+# exec'd directly, saving the intermediate /bin/sh fork+exec.
+_SHELL_CHARS = frozenset("|&;<>()$`\\\"'*?[]{}~#=%!\n")
+
+
+@functools.lru_cache(maxsize=128)
+def _split_simple_command(cmd: str) -> Optional[Tuple[str, ...]]:
+    """Return argv for a command that can run without a shell, else None.
+
+    Cached, since agents rerun the same commands and the PATH lookup is a
+    stat() per directory.
+    """
+    if os.name != "posix" or _SHELL_CHARS.intersection(cmd):
+        return None
+    argv = tuple(cmd.split())
+    # Shell builtins (cd, exit, ...) have no binary to exec
+    if not argv or shutil.which(argv[0]) is None:
+        return None
+    return argv
+
+
+async def _drain(stream: asyncio.StreamReader, cap: int = _MAX_COMMAND_OUTPUT) -> bytes:
+    """Read a stream to EOF, keeping at most ``cap`` bytes of it."""
+    buf = bytearray()
+    truncated = False
+    while data := await stream.read(_READ_CHUNK):
+        room = cap - len(buf)
+        if len(data) > room:
+            truncated = True
+        if room > 0:
+            buf += data[:room]
+    if truncated:
+        buf += _OUTPUT_TRUNCATED
+    return bytes(buf)
+
 
 @runtime_checkable
 class FileOperator(Protocol):
@@ -32,6 +83,14 @@ class FileOperator(Protocol):
         """Check if path exists."""
         ...
 
+    async def path_type(self, path: PathLike) -> Optional[str]:
+        """Return "dir", "file" or None (missing) with a single lookup."""
+        ...
+
+    async def list_directory(self, path: PathLike) -> Tuple[str, str]:
+        """List non-hidden entries up to 2 levels deep; return (listing, errors)."""
+        ...
+
     async def run_command(
         self, cmd: str, timeout: Optional[float] = 120.0
     ) -> Tuple[int, str, str]:
@@ -44,17 +103,144 @@ class LocalFileOperator(FileOperator):
 
     encoding: str = "utf-8"
 
+    def __init__(self):
+        # path -> (stat signature, content), oldest first
+        self._read_cache: Dict[str, Tuple[Tuple[int, ...], str]] = {}
+
     async def read_file(self, path: PathLike) -> str:
         """Read content from a local file."""
         try:
-            return Path(path).read_text(encoding=self.encoding)
+            return self._read_sync(path)
         except Exception as e:
             raise ToolError(f"Failed to read {path}: {str(e)}") from None
 
+    @staticmethod
+    def _signature(st: os.stat_result) -> Tuple[int, ...]:
+        """Stat fields that change whenever a file's content may have.
+
+        mtime and size alone miss a same-size rewrite within one timestamp
+        tick. The inode catches replace-style writes (sed -i, our own atomic
+        writes), and ctime catches an mtime that was set back explicitly.
+        """
+        return (st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+
+    def _cache_content(self, path: PathLike, st: os.stat_result, content: str) -> None:
+        """Remember a file's content, evicting the least recently cached."""
+        key = str(path)
+        self._read_cache.pop(key, None)
+        self._read_cache[key] = (self._signature(st), content)
+        if len(self._read_cache) > _READ_CACHE_SIZE:
+            del self._read_cache[next(iter(self._read_cache))]
+
+    def _read_sync(self, path: PathLike) -> str:
+        """Read a whole local file with raw os.read calls, skipping buffered IO.
+
+        Served from the cache when the file's stat signature is unchanged.
+        """
+        st = os.stat(path)
+        cached = self._read_cache.get(str(path))
+        if cached and cached[0] == self._signature(st):
+            return cached[1]
+
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            chunks = []
+            st = os.fstat(fd)
+            size = st.st_size
+            # st_size is a hint; keep reading until EOF in case the file grew
+            while chunk := os.read(fd, max(size, _READ_CHUNK)):
+                chunks.append(chunk)
+        finally:
+            os.close(fd)
+        text = b"".join(chunks).decode(self.encoding)
+        # Match read_text()'s universal newlines
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        self._cache_content(path, st, text)
+        return text
+
+    @staticmethod
+    def _ensure_parent_dir(path: PathLike) -> None:
+        """Create the parent directory if needed, without a separate exists() stat."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def _temp_for(cls, path: PathLike) -> Tuple[str, str, Optional[int]]:
+        """Return (target, temp path, mode to keep) for an atomic write to path.
+
+        The target is the symlink-resolved path, so links are written through
+        rather than replaced; an existing file's permission bits are kept.
+        """
+        target = os.path.realpath(path)
+        cls._ensure_parent_dir(target)
+        try:
+            mode = stat.S_IMODE(os.stat(target).st_mode)
+        except FileNotFoundError:
+            mode = None
+        directory, name = os.path.split(target)
+        return (
+            target,
+            os.path.join(directory, f".{name}.{os.urandom(4).hex()}.tmp"),
+            mode,
+        )
+
+    @staticmethod
+    def _replace(tmp: str, target: str, mode: Optional[int]) -> None:
+        """Move a fully written temp file over target in one atomic rename."""
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, target)
+
+    @staticmethod
+    def _write_in_place(path: str, data: memoryview) -> None:
+        """Truncate and overwrite path itself, keeping its inode and owner."""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data) :]
+        finally:
+            os.close(fd)
+
+    def _write_sync(self, path: PathLike, content: str) -> None:
+        """Write a temp file next to path and rename it over path.
+
+        The rename gives path a new inode: hard links to the old file keep
+        the old content, and the file ends up owned by the agent's user (its
+        permission bits are kept). Where the directory does not allow
+        creating the temp file, path is overwritten in place instead.
+        """
+        target, tmp, mode = self._temp_for(path)
+        # Encode once and write raw bytes, bypassing the buffered text layer
+        data = memoryview(content.encode(self.encoding))
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except PermissionError:
+            self._write_in_place(target, data)
+            return
+        try:
+            try:
+                while data:
+                    data = data[os.write(fd, data) :]
+            finally:
+                os.close(fd)
+            self._replace(tmp, target, mode)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+
     async def write_file(self, path: PathLike, content: str) -> None:
         """Write content to a local file."""
         try:
-            Path(path).write_text(content, encoding=self.encoding)
+            # One thread hop for the whole write keeps the event loop free.
+            await asyncio.to_thread(self._write_sync, path, content)
+            # Reading back would translate newlines, so only cache plain text
+            if "\r" in content:
+                self._read_cache.pop(str(path), None)
+            else:
+                self._cache_content(path, os.stat(path), content)
         except Exception as e:
             raise ToolError(f"Failed to write to {path}: {str(e)}") from None
 
@@ -66,28 +252,80 @@ class LocalFileOperator(FileOperator):
         """Check if path exists."""
         return Path(path).exists()
 
+    async def path_type(self, path: PathLike) -> Optional[str]:
+        """Return "dir", "file" or None (missing) from one stat() call."""
+        try:
+            mode = os.stat(path).st_mode
+        except (OSError, ValueError):
+            return None
+        return "dir" if stat.S_ISDIR(mode) else "file"
+
+    @staticmethod
+    def _list_directory_sync(path: PathLike) -> Tuple[str, str]:
+        """Walk two levels with os.scandir, listing entries in `find` order."""
+        root = str(path)
+        lines, errors = [root], []
+
+        def scan(directory: str) -> List[os.DirEntry]:
+            try:
+                with os.scandir(directory) as it:
+                    return [e for e in it if not e.name.startswith(".")]
+            except OSError as e:
+                errors.append(f"find: '{directory}': {e.strerror}")
+                return []
+
+        for entry in scan(root):
+            lines.append(entry.path)
+            if entry.is_dir(follow_symlinks=False):
+                lines.extend(sub.path for sub in scan(entry.path))
+        return "".join(line + "\n" for line in lines), "\n".join(errors)
+
+    async def list_directory(self, path: PathLike) -> Tuple[str, str]:
+        """List non-hidden entries up to 2 levels deep, without spawning `find`."""
+        return await asyncio.to_thread(self._list_directory_sync, path)
+
     async def run_command(
         self, cmd: str, timeout: Optional[float] = 120.0
     ) -> Tuple[int, str, str]:
         """Run a shell command locally."""
-        process = await asyncio.create_subprocess_shell(
-            cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        # Own session, so a timeout can kill the shell and everything it spawned.
+        options = dict(
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
         )
+        process = None
+        argv = _split_simple_command(cmd)
+        if argv:
+            try:
+                process = await asyncio.create_subprocess_exec(*argv, **options)
+            except FileNotFoundError:
+                # Binary removed since the cached lookup; let the shell report it
+                _split_simple_command.cache_clear()
+        if process is None:
+            process = await asyncio.create_subprocess_shell(cmd, **options)
 
         try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(), timeout=timeout
-            )
+            # The deadline covers reading both streams and reaping the child
+            async with asyncio.timeout(timeout):
+                stdout, stderr, _ = await asyncio.gather(
+                    _drain(process.stdout), _drain(process.stderr), process.wait()
+                )
             return (
                 process.returncode or 0,
-                stdout.decode(),
-                stderr.decode(),
+                stdout.decode(errors="replace"),
+                stderr.decode(errors="replace"),
             )
-        except asyncio.TimeoutError as exc:
+        except TimeoutError as exc:
             try:
-                process.kill()
+                if hasattr(os, "killpg"):
+                    os.killpg(process.pid, signal.SIGKILL)
+                else:
+                    process.kill()
             except ProcessLookupError:
                 pass
+            # Reap the child so its transport and pipes are closed now.
+            await process.wait()
             raise TimeoutError(
                 f"Command '{cmd}' timed out after {timeout} seconds"
             ) from exc
@@ -136,6 +374,21 @@ class SandboxFileOperator(FileOperator):
         )
         return result.strip() == "true"
 
+    async def path_type(self, path: PathLike) -> Optional[str]:
+        """Return "dir", "file" or None (missing) from one sandbox command."""
+        await self._ensure_sandbox_initialized()
+        result = await self.sandbox_client.run_command(
+            f"test -d {path} && echo 'dir' || (test -e {path} && echo 'file')"
+        )
+        return result.strip() or None
+
+    async def list_directory(self, path: PathLike) -> Tuple[str, str]:
+        """List non-hidden entries up to 2 levels deep in sandbox."""
+        _, stdout, stderr = await self.run_command(
+            f"find {path} -maxdepth 2 -not -path '*/\\.*'"
+        )
+        return stdout, stderr
+
     async def run_command(
         self, cmd: str, timeout: Optional[float] = 120.0
     ) -> Tuple[int, str, str]:
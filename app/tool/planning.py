@@ -1,10 +1,29 @@
 # tool/planning.py
-from typing import Dict, List, Literal, Optional
+from typing import Dict, List, Literal, Optional, Tuple
+
+from pydantic import Field, PrivateAttr
 
 from app.exceptions import ToolError
 from app.tool.base import BaseTool, ToolResult
 
 
+_STATUS_SYMBOL = {
+    "not_started": "[ ]",
+    "in_progress": "[→]",
+    "completed": "[✓]",
+    "blocked": "[!]",
+}
+_VALID_STATUSES = frozenset(_STATUS_SYMBOL)
+
+
+def _count_statuses(step_statuses: List[str]) -> Dict[str, int]:
+    """Count steps per status."""
+    counts = dict.fromkeys(_STATUS_SYMBOL, 0)
+    for status in step_statuses:
+        counts[status] = counts.get(status, 0) + 1
+    return counts
+
+
 _PLANNING_TOOL_DESCRIPTION = """
 A planning tool that allows the agent to create and manage plans for solving complex tasks.
 The tool provides functionality for creating plans, updating plan steps, and tracking progress.
@@ -66,8 +85,16 @@ class PlanningTool(BaseTool):
         "additionalProperties": False,
     }
 
-    plans: dict = {}  # Dictionary to store plans by plan_id
-    _current_plan_id: Optional[str] = None  # Track the current active plan
+    # Dictionary to store plans by plan_id
+    plans: Dict[str, dict] = Field(default_factory=dict)
+    # Track the current active plan
+    _current_plan_id: Optional[str] = PrivateAttr(default=None)
+    # Per-plan step counts by status, with a copy of the statuses they were
+    # counted from. Rebuilt whenever a plan's statuses no longer match, so
+    # code editing step_statuses directly (PlanningFlow) needs no hook.
+    _status_counts: Dict[str, Tuple[List[str], Dict[str, int]]] = PrivateAttr(
+        default_factory=dict
+    )
 
     async def execute(
         self,
@@ -185,18 +212,18 @@ class PlanningTool(BaseTool):
             old_statuses = plan["step_statuses"]
             old_notes = plan["step_notes"]
 
-            # Create new step statuses and notes
-            new_statuses = []
-            new_notes = []
-
-            for i, step in enumerate(steps):
-                # If the step exists at the same position in old steps, preserve status and notes
-                if i < len(old_steps) and step == old_steps[i]:
-                    new_statuses.append(old_statuses[i])
-                    new_notes.append(old_notes[i])
-                else:
-                    new_statuses.append("not_started")
-                    new_notes.append("")
+            # A step keeps its status and notes only if it is unchanged at the
+            # same position; zip stops at the shorter plan, the rest start fresh
+            unchanged = [step == old for step, old in zip(steps, old_steps)]
+            new_statuses = [
+                status if keep else "not_started"
+                for keep, status in zip(unchanged, old_statuses)
+            ]
+            new_statuses += ["not_started"] * (len(steps) - len(new_statuses))
+            new_notes = [
+                note if keep else "" for keep, note in zip(unchanged, old_notes)
+            ]
+            new_notes += [""] * (len(steps) - len(new_notes))
 
             plan["steps"] = steps
             plan["step_statuses"] = new_statuses
@@ -213,17 +240,16 @@ class PlanningTool(BaseTool):
                 output="No plans available. Create a plan with the 'create' command."
             )
 
-        output = "Available plans:\n"
+        lines = ["Available plans:"]
         for plan_id, plan in self.plans.items():
             current_marker = " (active)" if plan_id == self._current_plan_id else ""
-            completed = sum(
-                1 for status in plan["step_statuses"] if status == "completed"
+            completed = self._get_status_counts(plan)["completed"]
+            lines.append(
+                f"• {plan_id}{current_marker}: {plan['title']} - "
+                f"{completed}/{len(plan['steps'])} steps completed"
             )
-            total = len(plan["steps"])
-            progress = f"{completed}/{total} steps completed"
-            output += f"• {plan_id}{current_marker}: {plan['title']} - {progress}\n"
 
-        return ToolResult(output=output)
+        return ToolResult(output="\n".join(lines) + "\n")
 
     def _get_plan(self, plan_id: Optional[str]) -> ToolResult:
         """Get details of a specific plan."""
@@ -283,18 +309,17 @@ class PlanningTool(BaseTool):
                 f"Invalid step_index: {step_index}. Valid indices range from 0 to {len(plan['steps'])-1}."
             )
 
-        if step_status and step_status not in [
-            "not_started",
-            "in_progress",
-            "completed",
-            "blocked",
-        ]:
+        if step_status and step_status not in _VALID_STATUSES:
             raise ToolError(
                 f"Invalid step_status: {step_status}. Valid statuses are: not_started, in_progress, completed, blocked"
             )
 
         if step_status:
-            plan["step_statuses"][step_index] = step_status
+            counts = self._get_status_counts(plan)
+            counted = self._status_counts[plan_id][0]
+            counts[counted[step_index]] -= 1
+            counts[step_status] += 1
+            counted[step_index] = plan["step_statuses"][step_index] = step_status
 
         if step_notes:
             plan["step_notes"][step_index] = step_notes
@@ -312,6 +337,7 @@ class PlanningTool(BaseTool):
             raise ToolError(f"No plan found with ID: {plan_id}")
 
         del self.plans[plan_id]
+        self._status_counts.pop(plan_id, None)
 
         # If the deleted plan was the active plan, clear the active plan
         if self._current_plan_id == plan_id:
@@ -319,45 +345,48 @@ class PlanningTool(BaseTool):
 
         return ToolResult(output=f"Plan '{plan_id}' has been deleted.")
 
+    def _get_status_counts(self, plan: Dict) -> Dict[str, int]:
+        """Return the plan's step counts by status, recounting if stale."""
+        statuses = plan["step_statuses"]
+        cached = self._status_counts.get(plan["plan_id"])
+        # A list comparison is far cheaper than recounting in Python
+        if cached is None or cached[0] != statuses:
+            cached = (list(statuses), _count_statuses(statuses))
+            self._status_counts[plan["plan_id"]] = cached
+        return cached[1]
+
     def _format_plan(self, plan: Dict) -> str:
         """Format a plan for display."""
-        output = f"Plan: {plan['title']} (ID: {plan['plan_id']})\n"
-        output += "=" * len(output) + "\n\n"
+        header = f"Plan: {plan['title']} (ID: {plan['plan_id']})\n"
+        parts: List[str] = [header, "=" * len(header), "\n\n"]
 
         # Calculate progress statistics
         total_steps = len(plan["steps"])
-        completed = sum(1 for status in plan["step_statuses"] if status == "completed")
-        in_progress = sum(
-            1 for status in plan["step_statuses"] if status == "in_progress"
-        )
-        blocked = sum(1 for status in plan["step_statuses"] if status == "blocked")
-        not_started = sum(
-            1 for status in plan["step_statuses"] if status == "not_started"
-        )
+        counts = self._get_status_counts(plan)
+        completed = counts["completed"]
+        in_progress = counts["in_progress"]
+        blocked = counts["blocked"]
+        not_started = counts["not_started"]
 
-        output += f"Progress: {completed}/{total_steps} steps completed "
+        parts.append(f"Progress: {completed}/{total_steps} steps completed ")
         if total_steps > 0:
             percentage = (completed / total_steps) * 100
-            output += f"({percentage:.1f}%)\n"
+            parts.append(f"({percentage:.1f}%)\n")
         else:
-            output += "(0%)\n"
+            parts.append("(0%)\n")
 
-        output += f"Status: {completed} completed, {in_progress} in progress, {blocked} blocked, {not_started} not started\n\n"
-        output += "Steps:\n"
+        parts.append(
+            f"Status: {completed} completed, {in_progress} in progress, {blocked} blocked, {not_started} not started\n\n"
+        )
+        parts.append("Steps:\n")
 
         # Add each step with its status and notes
         for i, (step, status, notes) in enumerate(
             zip(plan["steps"], plan["step_statuses"], plan["step_notes"])
         ):
-            status_symbol = {
-                "not_started": "[ ]",
-                "in_progress": "[→]",
-                "completed": "[✓]",
-                "blocked": "[!]",
-            }.get(status, "[ ]")
-
-            output += f"{i}. {status_symbol} {step}\n"
+            status_symbol = _STATUS_SYMBOL.get(status, "[ ]")
+            parts.append(f"{i}. {status_symbol} {step}\n")
             if notes:
-                output += f"   Notes: {notes}\n"
+                parts.append(f"   Notes: {notes}\n")
 
-        return output
+        return "".join(parts)
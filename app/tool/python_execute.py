@@ -1,11 +1,140 @@
+import asyncio
 import multiprocessing
+import os
+import signal
+import subprocess
 import sys
-from io import StringIO
-from typing import Dict
+from multiprocessing.connection import Connection
+from typing import Dict, List, Optional, Tuple
 
+from pydantic import PrivateAttr
+
+from app.tool import python_worker
 from app.tool.base import BaseTool
 
 
+_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# On POSIX, snippets run in fresh interpreters started from this standalone
+# script, which imports only the standard library (and the libraries it warms
+# up), rather than in processes derived from the agent's, which would carry
+# the app package and the entry script along. Elsewhere (Windows) fds cannot
+# be passed to a child, so workers are multiprocessing spawn processes running
+# the same serve() loop; those do import the app package, and killing one
+# does not reach processes its snippet started.
+_WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), "python_worker.py")
+_SCRIPT_WORKERS = os.name == "posix"
+
+# Idle workers, shared by every PythonExecute instance.
+_IDLE_WORKERS: List["_Worker"] = []
+
+
+class _Worker:
+    """A worker process and the pipes snippets are sent to it over.
+
+    Each worker is handled on its own, so one that overruns its timeout can
+    be killed without disturbing snippets running in the others.
+    """
+
+    def __init__(self):
+        if _SCRIPT_WORKERS:
+            self._start_script()
+        else:
+            self._start_spawned()
+        try:
+            # The worker reports ready once its warm-up imports are done, so
+            # they never count against the first snippet's timeout
+            self._replies.recv()
+        except BaseException:
+            self.kill()
+            raise
+
+    def _start_script(self) -> None:
+        parent_r, child_w = os.pipe()
+        child_r, parent_w = os.pipe()
+        try:
+            # -P keeps app/tool off sys.path, so its modules cannot shadow
+            # what snippets import. Own session, so a kill takes the
+            # snippet's child processes along and Ctrl+C doesn't reach it.
+            self.process = subprocess.Popen(
+                [sys.executable, "-P", _WORKER_SCRIPT, str(child_r), str(child_w)],
+                stdin=subprocess.DEVNULL,
+                pass_fds=(child_r, child_w),
+                start_new_session=True,
+            )
+        except BaseException:
+            os.close(parent_r)
+            os.close(parent_w)
+            raise
+        finally:
+            os.close(child_r)
+            os.close(child_w)
+        self._requests = Connection(parent_w, readable=False)
+        self._replies = Connection(parent_r, writable=False)
+
+    def _start_spawned(self) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        child_requests, self._requests = ctx.Pipe(duplex=False)
+        self._replies, child_replies = ctx.Pipe(duplex=False)
+        self.process = ctx.Process(
+            target=python_worker.serve,
+            args=(child_requests, child_replies),
+            daemon=True,
+        )
+        try:
+            self.process.start()
+        finally:
+            child_requests.close()
+            child_replies.close()
+
+    def is_alive(self) -> bool:
+        if _SCRIPT_WORKERS:
+            return self.process.poll() is None
+        return self.process.is_alive()
+
+    def run(self, code: str, timeout: int) -> Optional[Tuple[str, bool]]:
+        """Run code; None if it did not finish within timeout. Blocking.
+
+        The worker is idle and warmed up, so it picks the snippet up at once
+        and the timeout covers only running it. Raises EOFError or OSError if
+        the worker died.
+        """
+        self._requests.send((code, timeout))
+        if not self._replies.poll(timeout):
+            return None
+        return self._replies.recv()
+
+    def kill(self) -> None:
+        try:
+            if _SCRIPT_WORKERS:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+        except ProcessLookupError:
+            pass
+
+
+def _take_worker() -> _Worker:
+    """Return an idle worker, starting a new one if there is none.
+
+    Blocks until a new worker is ready; raises EOFError if it died starting.
+    """
+    while True:
+        try:
+            worker = _IDLE_WORKERS.pop()
+        except IndexError:
+            return _Worker()
+        if worker.is_alive():
+            return worker
+
+
+def _release_worker(worker: _Worker) -> None:
+    if len(_IDLE_WORKERS) < _MAX_WORKERS:
+        _IDLE_WORKERS.append(worker)
+    else:
+        worker.kill()
+
+
 class PythonExecute(BaseTool):
     """A tool for executing Python code with timeout and safety restrictions."""
 
@@ -22,19 +151,11 @@ class PythonExecute(BaseTool):
         "required": ["code"],
     }
 
-    def _run_code(self, code: str, result_dict: dict, safe_globals: dict) -> None:
-        original_stdout = sys.stdout
-        try:
-            output_buffer = StringIO()
-            sys.stdout = output_buffer
-            exec(code, safe_globals, safe_globals)
-            result_dict["observation"] = output_buffer.getvalue()
-            result_dict["success"] = True
-        except Exception as e:
-            result_dict["observation"] = str(e)
-            result_dict["success"] = False
-        finally:
-            sys.stdout = original_stdout
+    # Bounds the snippets run at once; waiting here does not count against
+    # a snippet's timeout.
+    _slots: asyncio.Semaphore = PrivateAttr(
+        default_factory=lambda: asyncio.Semaphore(_MAX_WORKERS)
+    )
 
     async def execute(
         self,
@@ -52,24 +173,28 @@ class PythonExecute(BaseTool):
             Dict: Contains 'output' with execution output or error message and 'success' status.
         """
 
-        with multiprocessing.Manager() as manager:
-            result = manager.dict({"observation": "", "success": False})
-            if isinstance(__builtins__, dict):
-                safe_globals = {"__builtins__": __builtins__}
-            else:
-                safe_globals = {"__builtins__": __builtins__.__dict__.copy()}
-            proc = multiprocessing.Process(
-                target=self._run_code, args=(code, result, safe_globals)
-            )
-            proc.start()
-            proc.join(timeout)
-
-            # timeout process
-            if proc.is_alive():
-                proc.terminate()
-                proc.join(1)
+        async with self._slots:
+            worker = result = None
+            try:
+                worker = await asyncio.to_thread(_take_worker)
+                result = await asyncio.to_thread(worker.run, code, timeout)
+            except (EOFError, OSError):
                 return {
-                    "observation": f"Execution timeout after {timeout} seconds",
+                    "observation": "Execution process terminated unexpectedly",
                     "success": False,
                 }
-            return dict(result)
+            finally:
+                # A snippet still running (timed out, or the call was
+                # cancelled) cannot be stopped, so only its worker is killed.
+                if worker is not None and result is None:
+                    worker.kill()
+                elif worker is not None:
+                    _release_worker(worker)
+
+        if result is None:
+            return {
+                "observation": f"Execution timeout after {timeout} seconds",
+                "success": False,
+            }
+        observation, success = result
+        return {"observation": observation, "success": success}
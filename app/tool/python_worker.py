@@ -0,0 +1,175 @@
+"""Worker process for PythonExecute.
+
+On POSIX it is run as a script (``python -P python_worker.py <read fd> <write
+fd>``): it only needs the standard library, so a worker does not load the app
+package, its config or logger. Elsewhere, where fds cannot be passed to a
+child, PythonExecute starts serve() in a multiprocessing spawn process.
+
+A worker sends ``"ready"`` once its start-up is done, then receives
+``(code, timeout)`` pairs and answers each with ``(observation, success)``.
+"""
+
+import builtins
+import functools
+import importlib
+import sys
+from io import TextIOBase
+from multiprocessing.connection import Connection
+from typing import List, Tuple
+
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Address-space limit applied to every worker, so a snippet cannot allocate
+# the host's memory away. Generous enough for numpy/pandas imports.
+_MEMORY_LIMIT_BYTES = 2 << 30
+
+# Cap on buffered print output. A snippet that prints past it is stopped, so
+# a runaway print loop neither exhausts the worker's memory nor burns CPU
+# until the timeout fires.
+_MAX_OUTPUT_CHARS = 1 << 20
+_TRUNCATED_MARKER = "\n...[output truncated, execution stopped]"
+
+# Libraries snippets commonly import. They are imported when the worker
+# starts so that `import numpy` in a snippet is a sys.modules lookup;
+# ones that are missing or fail to import are skipped.
+_WARM_MODULES = [
+    "collections",
+    "itertools",
+    "json",
+    "math",
+    "re",
+    "numpy",
+    "pandas",
+]
+
+# Pristine builtins, snapshotted once at start-up. Each call gets its own
+# shallow copy of it, since workers are reused: a snippet that rebinds a
+# builtin must not leak that into the worker itself or into later snippets.
+_BUILTINS = builtins.__dict__.copy()
+
+
+class _OutputLimitReached(BaseException):
+    """Raised from print() to stop a snippet once its output is capped.
+
+    A BaseException, so a snippet's ``except Exception`` does not swallow it.
+    """
+
+
+class _OutputSink(TextIOBase):
+    """Write-only stdout replacement that appends chunks to a list.
+
+    Appending is amortized O(1) and the output is joined once at the end,
+    instead of StringIO's buffer growth and final getvalue() copy. Writing
+    past ``cap`` characters raises _OutputLimitReached.
+    """
+
+    def __init__(self, cap: int = _MAX_OUTPUT_CHARS):
+        super().__init__()
+        self._chunks: List[str] = []
+        self._remaining = cap
+        self.truncated = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        n = len(s)
+        if self.truncated:
+            raise _OutputLimitReached
+        if n > self._remaining:
+            self._chunks.append(s[: self._remaining])
+            self._chunks.append(_TRUNCATED_MARKER)
+            self._remaining = 0
+            self.truncated = True
+            raise _OutputLimitReached
+        self._chunks.append(s)
+        self._remaining -= n
+        return n
+
+    def getvalue(self) -> str:
+        return "".join(self._chunks)
+
+
+def _init_worker() -> None:
+    """Apply the per-worker memory limit."""
+    if resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = _MEMORY_LIMIT_BYTES
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _limit_cpu(timeout: int) -> None:
+    """Cap this snippet's CPU time; workers are reused, so count from now."""
+    if resource is None:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + timeout + 1
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(code: str):
+    """Compile a snippet once per worker; retried snippets skip the compiler."""
+    return compile(code, "<python_execute>", "exec")
+
+
+def _run_code(code: str, timeout: int) -> Tuple[str, bool]:
+    """Run code and return ``(observation, success)``."""
+    _limit_cpu(timeout)
+    safe_globals = {"__builtins__": dict(_BUILTINS)}
+    original_stdout = sys.stdout
+    try:
+        output_buffer = _OutputSink()
+        sys.stdout = output_buffer
+        exec(_compile(code), safe_globals, safe_globals)
+        return output_buffer.getvalue(), True
+    except _OutputLimitReached:
+        return output_buffer.getvalue(), False
+    except (Exception, SystemExit) as e:
+        # SystemExit must not end the worker, which serves later snippets too
+        return str(e), False
+    finally:
+        sys.stdout = original_stdout
+
+
+def serve(requests: Connection, replies: Connection) -> None:
+    """Run snippets from requests until the agent closes its end."""
+    # Limit memory before the warm imports, so they count against it too
+    _init_worker()
+    for name in _WARM_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            # Missing, or broken (e.g. pandas built against another numpy):
+            # that should fail only the snippets importing it, not the worker
+            pass
+    # Tell the agent the warm-up is over; its snippet timeouts start from here
+    replies.send("ready")
+
+    while True:
+        try:
+            code, timeout = requests.recv()
+        except EOFError:  # the agent went away
+            return
+        replies.send(_run_code(code, timeout))
+
+
+def main() -> None:
+    read_fd, write_fd = (int(fd) for fd in sys.argv[1:3])
+    serve(Connection(read_fd, writable=False), Connection(write_fd, readable=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,23 @@
 from typing import List
 
-from baidusearch.baidusearch import search
+from app.tool.search.base import (
+    SearchItem,
+    WebSearchEngine,
+    run_blocking,
+    to_search_items,
+)
 
-from app.tool.search.base import SearchItem, WebSearchEngine
+
+def _search(query: str, num_results: int) -> list:
+    """Run a Baidu search; blocking, meant for a worker thread."""
+    # Imported on first use so loading app.tool doesn't pay for it
+    from baidusearch.baidusearch import search
+
+    return search(query, num_results=num_results)
 
 
 class BaiduSearchEngine(WebSearchEngine):
-    def perform_search(
+    async def _perform_search(
         self, query: str, num_results: int = 10, *args, **kwargs
     ) -> List[SearchItem]:
         """
@@ -14,41 +25,6 @@ class BaiduSearchEngine(WebSearchEngine):
 
         Returns results formatted according to SearchItem model.
         """
-        raw_results = search(query, num_results=num_results)
-
-        # Convert raw results to SearchItem format
-        results = []
-        for i, item in enumerate(raw_results):
-            if isinstance(item, str):
-                # If it's just a URL
-                results.append(
-                    SearchItem(title=f"Baidu Result {i+1}", url=item, description=None)
-                )
-            elif isinstance(item, dict):
-                # If it's a dictionary with details
-                results.append(
-                    SearchItem(
-                        title=item.get("title", f"Baidu Result {i+1}"),
-                        url=item.get("url", ""),
-                        description=item.get("abstract", None),
-                    )
-                )
-            else:
-                # Try to get attributes directly
-                try:
-                    results.append(
-                        SearchItem(
-                            title=getattr(item, "title", f"Baidu Result {i+1}"),
-                            url=getattr(item, "url", ""),
-                            description=getattr(item, "abstract", None),
-                        )
-                    )
-                except Exception:
-                    # Fallback to a basic result
-                    results.append(
-                        SearchItem(
-                            title=f"Baidu Result {i+1}", url=str(item), description=None
-                        )
-                    )
-
-        return results
+        raw_results = await run_blocking(_search, query, num_results)
+
+        return to_search_items(raw_results, "Baidu", description_key="abstract")
@@ -1,6 +1,24 @@
-from typing import List, Optional
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+
+# Search libraries are blocking. They run in a small dedicated pool rather
+# than the loop's default executor, so a burst of searches cannot crowd out
+# other to_thread() work or spawn a thread per request.
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="websearch")
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking search call in the search thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _SEARCH_POOL, functools.partial(func, *args, **kwargs)
+    )
 
 
 class SearchItem(BaseModel):
@@ -17,12 +35,64 @@ class SearchItem(BaseModel):
         return f"{self.title} - {self.url}"
 
 
+def to_search_items(
+    raw_results: Iterable[Any],
+    source: str,
+    url_key: str = "url",
+    description_key: str = "description",
+) -> List[SearchItem]:
+    """
+    Normalize a search library's raw results into SearchItem objects.
+
+    Items may be bare URL strings, dicts, or objects with attributes; the
+    field names used for the URL and description vary by library.
+    """
+    return [
+        _to_search_item(item, f"{source} Result {i}", url_key, description_key)
+        for i, item in enumerate(raw_results, 1)
+    ]
+
+
+def _to_search_item(
+    item: Any, default_title: str, url_key: str, description_key: str
+) -> SearchItem:
+    if isinstance(item, str):
+        return SearchItem(title=default_title, url=item, description=None)
+    if isinstance(item, dict):
+        return SearchItem(
+            title=item.get("title", default_title),
+            url=item.get(url_key, ""),
+            description=item.get(description_key, None),
+        )
+    try:
+        return SearchItem(
+            title=getattr(item, "title", default_title),
+            url=getattr(item, url_key, ""),
+            description=getattr(item, description_key, None),
+        )
+    except Exception:
+        return SearchItem(title=default_title, url=str(item), description=None)
+
+
 class WebSearchEngine(BaseModel):
-    """Base class for web search engines."""
+    """Base class for web search engines.
+
+    Results are cached per engine instance for ``CACHE_TTL`` seconds, and
+    concurrent identical searches share a single request. Subclasses
+    implement ``_perform_search``.
+    """
 
     model_config = {"arbitrary_types_allowed": True}
 
-    def perform_search(
+    CACHE_TTL: ClassVar[float] = 300.0
+    CACHE_SIZE: ClassVar[int] = 256
+
+    _cache: Dict[tuple, Tuple[float, List[SearchItem]]] = PrivateAttr(
+        default_factory=dict
+    )
+    _inflight: Dict[tuple, asyncio.Lock] = PrivateAttr(default_factory=dict)
+
+    async def perform_search(
         self, query: str, num_results: int = 10, *args, **kwargs
     ) -> List[SearchItem]:
         """
@@ -37,4 +107,30 @@ class WebSearchEngine(BaseModel):
         Returns:
             List[SearchItem]: A list of SearchItem objects matching the search query.
         """
+        key = (query, num_results, args, tuple(sorted(kwargs.items())))
+        lock = self._inflight.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                cached = self._cache.get(key)
+                if cached and time.monotonic() - cached[0] < self.CACHE_TTL:
+                    return list(cached[1])
+
+                results = await self._perform_search(
+                    query, num_results, *args, **kwargs
+                )
+                # Empty results are not cached so callers can retry them
+                if results:
+                    self._cache.pop(key, None)
+                    self._cache[key] = (time.monotonic(), results)
+                    if len(self._cache) > self.CACHE_SIZE:
+                        del self._cache[next(iter(self._cache))]
+                return list(results)
+        finally:
+            if not lock.locked() and self._inflight.get(key) is lock:
+                del self._inflight[key]
+
+    async def _perform_search(
+        self, query: str, num_results: int = 10, *args, **kwargs
+    ) -> List[SearchItem]:
+        """Run the search against the engine itself, bypassing the cache."""
         raise NotImplementedError
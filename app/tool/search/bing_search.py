@@ -4,7 +4,7 @@ import requests
 from bs4 import BeautifulSoup
 
 from app.logger import logger
-from app.tool.search.base import SearchItem, WebSearchEngine
+from app.tool.search.base import SearchItem, WebSearchEngine, run_blocking
 
 
 ABSTRACT_MAX_LENGTH = 300
@@ -133,7 +133,7 @@ class BingSearchEngine(WebSearchEngine):
             logger.warning(f"Error parsing HTML: {e}")
             return [], None
 
-    def perform_search(
+    async def _perform_search(
         self, query: str, num_results: int = 10, *args, **kwargs
     ) -> List[SearchItem]:
         """
@@ -141,4 +141,4 @@ class BingSearchEngine(WebSearchEngine):
 
         Returns results formatted according to SearchItem model.
         """
-        return self._search_sync(query, num_results=num_results)
+        return await run_blocking(self._search_sync, query, num_results=num_results)
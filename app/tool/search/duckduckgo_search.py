@@ -1,12 +1,25 @@
 from typing import List
 
-from duckduckgo_search import DDGS
+from app.tool.search.base import (
+    SearchItem,
+    WebSearchEngine,
+    run_blocking,
+    to_search_items,
+)
 
-from app.tool.search.base import SearchItem, WebSearchEngine
+
+def _text_search(query: str, max_results: int) -> list:
+    """Run a DuckDuckGo text search; blocking, meant for a worker thread."""
+    # Imported on first use so loading app.tool doesn't pay for it
+    from duckduckgo_search import DDGS
+
+    # A fresh session per call: DDGS is not documented as thread-safe
+    with DDGS() as ddgs:
+        return list(ddgs.text(query, max_results=max_results))
 
 
 class DuckDuckGoSearchEngine(WebSearchEngine):
-    def perform_search(
+    async def _perform_search(
         self, query: str, num_results: int = 10, *args, **kwargs
     ) -> List[SearchItem]:
         """
@@ -14,44 +27,8 @@ class DuckDuckGoSearchEngine(WebSearchEngine):
 
         Returns results formatted according to SearchItem model.
         """
-        raw_results = DDGS().text(query, max_results=num_results)
-
-        results = []
-        for i, item in enumerate(raw_results):
-            if isinstance(item, str):
-                # If it's just a URL
-                results.append(
-                    SearchItem(
-                        title=f"DuckDuckGo Result {i + 1}", url=item, description=None
-                    )
-                )
-            elif isinstance(item, dict):
-                # Extract data from the dictionary
-                results.append(
-                    SearchItem(
-                        title=item.get("title", f"DuckDuckGo Result {i + 1}"),
-                        url=item.get("href", ""),
-                        description=item.get("body", None),
-                    )
-                )
-            else:
-                # Try to extract attributes directly
-                try:
-                    results.append(
-                        SearchItem(
-                            title=getattr(item, "title", f"DuckDuckGo Result {i + 1}"),
-                            url=getattr(item, "href", ""),
-                            description=getattr(item, "body", None),
-                        )
-                    )
-                except Exception:
-                    # Fallback
-                    results.append(
-                        SearchItem(
-                            title=f"DuckDuckGo Result {i + 1}",
-                            url=str(item),
-                            description=None,
-                        )
-                    )
-
-        return results
+        raw_results = await run_blocking(_text_search, query, num_results)
+
+        return to_search_items(
+            raw_results, "DuckDuckGo", url_key="href", description_key="body"
+        )
@@ -1,12 +1,25 @@
 from typing import List
 
-from googlesearch import search
+from app.tool.search.base import (
+    SearchItem,
+    WebSearchEngine,
+    run_blocking,
+    to_search_items,
+)
 
-from app.tool.search.base import SearchItem, WebSearchEngine
+
+def _search(query: str, num_results: int) -> list:
+    """Run a Google search; blocking, meant for a worker thread."""
+    # Imported on first use so loading app.tool doesn't pay for it
+    from googlesearch import search
+
+    # googlesearch yields lazily and fetches pages while iterating, so the
+    # whole generator is drained here
+    return list(search(query, num_results=num_results, advanced=True))
 
 
 class GoogleSearchEngine(WebSearchEngine):
-    def perform_search(
+    async def _perform_search(
         self, query: str, num_results: int = 10, *args, **kwargs
     ) -> List[SearchItem]:
         """
@@ -14,20 +27,6 @@ class GoogleSearchEngine(WebSearchEngine):
 
         Returns results formatted according to SearchItem model.
         """
-        raw_results = search(query, num_results=num_results, advanced=True)
-
-        results = []
-        for i, item in enumerate(raw_results):
-            if isinstance(item, str):
-                # If it's just a URL
-                results.append(
-                    {"title": f"Google Result {i+1}", "url": item, "description": ""}
-                )
-            else:
-                results.append(
-                    SearchItem(
-                        title=item.title, url=item.url, description=item.description
-                    )
-                )
-
-        return results
+        raw_results = await run_blocking(_search, query, num_results)
+
+        return to_search_items(raw_results, "Google")
@@ -1,8 +1,21 @@
 """File and directory manipulation tool with sandbox support."""
 
-from collections import defaultdict
+from collections import defaultdict, deque
 from pathlib import Path
-from typing import Any, DefaultDict, List, Literal, Optional, get_args
+from typing import (
+    Any,
+    DefaultDict,
+    Deque,
+    Dict,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+    get_args,
+)
+
+from pydantic import PrivateAttr
 
 from app.config import config
 from app.exceptions import ToolError
@@ -20,12 +33,15 @@ Command = Literal[
     "view",
     "create",
     "str_replace",
+    "str_replace_batch",
     "insert",
     "undo_edit",
 ]
+_ALLOWED_COMMANDS: Tuple[str, ...] = get_args(Command)
 
 # Constants
 SNIPPET_LINES: int = 4
+MAX_HISTORY_PER_FILE: int = 32
 MAX_RESPONSE_LEN: int = 16000
 TRUNCATED_MESSAGE: str = (
     "<response clipped><NOTE>To save on context only part of this file has been shown to you. "
@@ -45,6 +61,7 @@ Notes for using the `str_replace` command:
 * The `old_str` parameter should match EXACTLY one or more consecutive lines from the original file. Be mindful of whitespaces!
 * If the `old_str` parameter is not unique in the file, the replacement will not be performed. Make sure to include enough context in `old_str` to make it unique
 * The `new_str` parameter should contain the edited lines that should replace the `old_str`
+* Use `str_replace_batch` with a list of `edits` to make several replacements, across one or more files, in one call; each file is read and written once
 """
 
 
@@ -57,6 +74,76 @@ def maybe_truncate(
     return content[:truncate_after] + TRUNCATED_MESSAGE
 
 
+class _ReverseEdit(NamedTuple):
+    """Undo record for one edit: `inserted` at `offset` replaced `removed`.
+
+    With `inserted` None, `removed` is a snapshot of the whole file.
+    """
+
+    offset: int
+    inserted: Optional[str]
+    removed: str
+
+
+def _expand_tabs(text: str) -> str:
+    """expandtabs(), skipping the copy when there are no tabs (most code)."""
+    return text.expandtabs() if "\t" in text else text
+
+
+def _find_unique(content: str, old_str: str, path: PathLike) -> int:
+    """Return the offset of the only occurrence of old_str, else raise ToolError."""
+    idx = content.find(old_str)
+    if idx == -1:
+        raise ToolError(
+            f"No replacement was performed, old_str `{old_str}` did not appear verbatim in {path}."
+        )
+    elif content.find(old_str, idx + len(old_str)) != -1:
+        # Find line numbers of occurrences, counting newlines incrementally
+        lines = []
+        lineno, pos = 1, 0
+        while idx != -1:
+            lineno += content.count("\n", pos, idx)
+            pos = idx
+            if not lines or lines[-1] != lineno:
+                lines.append(lineno)
+            idx = content.find(old_str, idx + 1)
+        raise ToolError(
+            f"No replacement was performed. Multiple occurrences of old_str `{old_str}` "
+            f"in lines {lines}. Please ensure it is unique"
+        )
+    return idx
+
+
+def _nth_newline_offset(text: str, n: int) -> int:
+    """Return the offset of the n-th newline in text, or len(text) if fewer."""
+    pos = -1
+    for _ in range(n):
+        pos = text.find("\n", pos + 1)
+        if pos == -1:
+            return len(text)
+    return pos
+
+
+def _line_window(text: str, start: int, end: int, context: int) -> str:
+    """Return the lines spanning text[start:end] plus `context` lines each side.
+
+    Hops newline to newline outwards from the span, so the cost depends on the
+    window size rather than on where in the file it sits.
+    """
+    lo = start
+    for _ in range(context + 1):
+        lo = text.rfind("\n", 0, lo)
+        if lo == -1:
+            break
+    hi = end - 1
+    for _ in range(context + 1):
+        hi = text.find("\n", hi + 1)
+        if hi == -1:
+            hi = len(text)
+            break
+    return text[lo + 1 : hi]
+
+
 class StrReplaceEditor(BaseTool):
     """A tool for viewing, creating, and editing files with sandbox support."""
 
@@ -66,8 +153,8 @@ class StrReplaceEditor(BaseTool):
         "type": "object",
         "properties": {
             "command": {
-                "description": "The commands to run. Allowed options are: `view`, `create`, `str_replace`, `insert`, `undo_edit`.",
-                "enum": ["view", "create", "str_replace", "insert", "undo_edit"],
+                "description": "The commands to run. Allowed options are: `view`, `create`, `str_replace`, `str_replace_batch`, `insert`, `undo_edit`.",
+                "enum": list(_ALLOWED_COMMANDS),
                 "type": "string",
             },
             "path": {
@@ -86,6 +173,19 @@ class StrReplaceEditor(BaseTool):
                 "description": "Optional parameter of `str_replace` command containing the new string (if not given, no string will be added). Required parameter of `insert` command containing the string to insert.",
                 "type": "string",
             },
+            "edits": {
+                "description": "Required parameter of `str_replace_batch` command. Replacements applied in order, each with `old_str`, an optional `new_str`, and an optional absolute `path` (defaults to `path`). If any replacement fails, no file is changed.",
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "path": {"type": "string"},
+                        "old_str": {"type": "string"},
+                        "new_str": {"type": "string"},
+                    },
+                    "required": ["old_str"],
+                },
+            },
             "insert_line": {
                 "description": "Required parameter of `insert` command. The `new_str` will be inserted AFTER the line `insert_line` of `path`.",
                 "type": "integer",
@@ -98,7 +198,9 @@ class StrReplaceEditor(BaseTool):
         },
         "required": ["command", "path"],
     }
-    _file_history: DefaultDict[PathLike, List[str]] = defaultdict(list)
+    _file_history: DefaultDict[PathLike, Deque[_ReverseEdit]] = PrivateAttr(
+        default_factory=lambda: defaultdict(lambda: deque(maxlen=MAX_HISTORY_PER_FILE))
+    )
     _local_operator: LocalFileOperator = LocalFileOperator()
     _sandbox_operator: SandboxFileOperator = SandboxFileOperator()
 
@@ -121,6 +223,7 @@ class StrReplaceEditor(BaseTool):
         old_str: str | None = None,
         new_str: str | None = None,
         insert_line: int | None = None,
+        edits: list[dict] | None = None,
         **kwargs: Any,
     ) -> str:
         """Execute a file operation command."""
@@ -128,16 +231,18 @@ class StrReplaceEditor(BaseTool):
         operator = self._get_operator()
 
         # Validate path and command combination
-        await self.validate_path(command, Path(path), operator)
+        path_type = await self.validate_path(command, Path(path), operator)
 
         # Execute the appropriate command
         if command == "view":
-            result = await self.view(path, view_range, operator)
+            result = await self.view(
+                path, view_range, operator, is_dir=path_type == "dir"
+            )
         elif command == "create":
             if file_text is None:
                 raise ToolError("Parameter `file_text` is required for command: create")
             await operator.write_file(path, file_text)
-            self._file_history[path].append(file_text)
+            self._file_history[path].append(_ReverseEdit(0, None, file_text))
             result = ToolResult(output=f"File created successfully at: {path}")
         elif command == "str_replace":
             if old_str is None:
@@ -145,6 +250,12 @@ class StrReplaceEditor(BaseTool):
                     "Parameter `old_str` is required for command: str_replace"
                 )
             result = await self.str_replace(path, old_str, new_str, operator)
+        elif command == "str_replace_batch":
+            if not edits:
+                raise ToolError(
+                    "Parameter `edits` is required for command: str_replace_batch"
+                )
+            result = await self.str_replace_batch(path, edits, operator)
         elif command == "insert":
             if insert_line is None:
                 raise ToolError(
@@ -158,32 +269,37 @@ class StrReplaceEditor(BaseTool):
         else:
             # This should be caught by type checking, but we include it for safety
             raise ToolError(
-                f'Unrecognized command {command}. The allowed commands for the {self.name} tool are: {", ".join(get_args(Command))}'
+                f'Unrecognized command {command}. The allowed commands for the {self.name} tool are: {", ".join(_ALLOWED_COMMANDS)}'
             )
 
         return str(result)
 
     async def validate_path(
         self, command: str, path: Path, operator: FileOperator
-    ) -> None:
-        """Validate path and command combination based on execution environment."""
+    ) -> Optional[str]:
+        """Validate path and command combination based on execution environment.
+
+        Returns the path's type ("dir", "file" or None) for non-create commands.
+        """
         # Check if path is absolute
         if not path.is_absolute():
             raise ToolError(f"The path {path} is not an absolute path")
 
         # Only check if path exists for non-create commands
         if command != "create":
-            if not await operator.exists(path):
+            # One lookup answers both existence and directory-ness
+            path_type = await operator.path_type(path)
+            if path_type is None:
                 raise ToolError(
                     f"The path {path} does not exist. Please provide a valid path."
                 )
 
             # Check if path is a directory
-            is_dir = await operator.is_directory(path)
-            if is_dir and command != "view":
+            if path_type == "dir" and command != "view":
                 raise ToolError(
                     f"The path {path} is a directory and only the `view` command can be used on directories"
                 )
+            return path_type
 
         # Check if file exists for create command
         elif command == "create":
@@ -192,16 +308,19 @@ class StrReplaceEditor(BaseTool):
                 raise ToolError(
                     f"File already exists at: {path}. Cannot overwrite files using command `create`."
                 )
+        return None
 
     async def view(
         self,
         path: PathLike,
         view_range: Optional[List[int]] = None,
         operator: FileOperator = None,
+        is_dir: Optional[bool] = None,
     ) -> CLIResult:
         """Display file or directory content."""
-        # Determine if path is a directory
-        is_dir = await operator.is_directory(path)
+        # Determine if path is a directory, unless the caller already knows
+        if is_dir is None:
+            is_dir = await operator.is_directory(path)
 
         if is_dir:
             # Directory handling
@@ -218,10 +337,7 @@ class StrReplaceEditor(BaseTool):
     @staticmethod
     async def _view_directory(path: PathLike, operator: FileOperator) -> CLIResult:
         """Display directory contents."""
-        find_cmd = f"find {path} -maxdepth 2 -not -path '*/\\.*'"
-
-        # Execute command using the operator
-        returncode, stdout, stderr = await operator.run_command(find_cmd)
+        stdout, stderr = await operator.list_directory(path)
 
         if not stderr:
             stdout = (
@@ -249,8 +365,7 @@ class StrReplaceEditor(BaseTool):
                     "Invalid `view_range`. It should be a list of two integers."
                 )
 
-            file_lines = file_content.split("\n")
-            n_lines_file = len(file_lines)
+            n_lines_file = file_content.count("\n") + 1
             init_line, final_line = view_range
 
             # Validate view range
@@ -270,11 +385,18 @@ class StrReplaceEditor(BaseTool):
                     f"larger or equal than its first `{init_line}`"
                 )
 
-            # Apply range
+            # Apply range by slicing at line offsets; only the range is split later
+            start = (
+                _nth_newline_offset(file_content, init_line - 1) + 1
+                if init_line > 1
+                else 0
+            )
             if final_line == -1:
-                file_content = "\n".join(file_lines[init_line - 1 :])
+                file_content = file_content[start:]
             else:
-                file_content = "\n".join(file_lines[init_line - 1 : final_line])
+                file_content = file_content[
+                    start : _nth_newline_offset(file_content, final_line)
+                ]
 
         # Format and return result
         return CLIResult(
@@ -290,43 +412,28 @@ class StrReplaceEditor(BaseTool):
     ) -> CLIResult:
         """Replace a unique string in a file with a new string."""
         # Read file content and expand tabs
-        file_content = (await operator.read_file(path)).expandtabs()
-        old_str = old_str.expandtabs()
-        new_str = new_str.expandtabs() if new_str is not None else ""
+        file_content = _expand_tabs(await operator.read_file(path))
+        old_str = _expand_tabs(old_str)
+        new_str = _expand_tabs(new_str) if new_str is not None else ""
 
-        # Check if old_str is unique in the file
-        occurrences = file_content.count(old_str)
-        if occurrences == 0:
-            raise ToolError(
-                f"No replacement was performed, old_str `{old_str}` did not appear verbatim in {path}."
-            )
-        elif occurrences > 1:
-            # Find line numbers of occurrences
-            file_content_lines = file_content.split("\n")
-            lines = [
-                idx + 1
-                for idx, line in enumerate(file_content_lines)
-                if old_str in line
-            ]
-            raise ToolError(
-                f"No replacement was performed. Multiple occurrences of old_str `{old_str}` "
-                f"in lines {lines}. Please ensure it is unique"
-            )
+        # Locate old_str and check that it is unique in the file
+        idx = _find_unique(file_content, old_str, path)
 
         # Replace old_str with new_str
-        new_file_content = file_content.replace(old_str, new_str)
+        new_file_content = (
+            file_content[:idx] + new_str + file_content[idx + len(old_str) :]
+        )
 
         # Write the new content to the file
         await operator.write_file(path, new_file_content)
 
-        # Save the original content to history
-        self._file_history[path].append(file_content)
+        # Save how to reverse the edit to history
+        self._file_history[path].append(_ReverseEdit(idx, new_str, old_str))
 
         # Create a snippet of the edited section
-        replacement_line = file_content.split(old_str)[0].count("\n")
+        replacement_line = file_content.count("\n", 0, idx)
         start_line = max(0, replacement_line - SNIPPET_LINES)
-        end_line = replacement_line + SNIPPET_LINES + new_str.count("\n")
-        snippet = "\n".join(new_file_content.split("\n")[start_line : end_line + 1])
+        snippet = _line_window(new_file_content, idx, idx + len(new_str), SNIPPET_LINES)
 
         # Prepare the success message
         success_msg = f"The file {path} has been edited. "
@@ -337,6 +444,57 @@ class StrReplaceEditor(BaseTool):
 
         return CLIResult(output=success_msg)
 
+    async def str_replace_batch(
+        self,
+        path: PathLike,
+        edits: List[dict],
+        operator: FileOperator = None,
+    ) -> CLIResult:
+        """Apply several unique-string replacements, reading and writing each file once."""
+        # Group edits by file, keeping their order within each file. Keyed on
+        # the normalized path, so two spellings of one file share a group
+        # instead of each rewriting it from the original content.
+        by_path: Dict[PathLike, List[dict]] = {}
+        for edit in edits:
+            if edit.get("old_str") is None:
+                raise ToolError(
+                    "Each edit of command str_replace_batch requires `old_str`"
+                )
+            by_path.setdefault(str(Path(edit.get("path") or path)), []).append(edit)
+
+        # Apply every edit in memory first, so a failing edit changes nothing
+        results = []
+        for edit_path, file_edits in by_path.items():
+            await self.validate_path("str_replace", Path(edit_path), operator)
+            original = _expand_tabs(await operator.read_file(edit_path))
+            content = original
+            # Edited span [lo, hi) in the current content
+            lo, hi = len(content), 0
+            for edit in file_edits:
+                old_str = _expand_tabs(edit["old_str"])
+                new_str = _expand_tabs(edit.get("new_str") or "")
+                idx = _find_unique(content, old_str, edit_path)
+                content = content[:idx] + new_str + content[idx + len(old_str) :]
+                lo = min(lo, idx)
+                hi = max(idx + len(new_str), hi + len(new_str) - len(old_str))
+            results.append((edit_path, original, content, lo, hi, len(file_edits)))
+
+        messages = []
+        for edit_path, original, content, lo, hi, count in results:
+            await operator.write_file(edit_path, content)
+            # One history entry per file, covering the whole edited span
+            removed = original[lo : hi - (len(content) - len(original))]
+            self._file_history[edit_path].append(
+                _ReverseEdit(lo, content[lo:hi], removed)
+            )
+            noun = "replacement" if count == 1 else "replacements"
+            messages.append(f"The file {edit_path} has been edited ({count} {noun}).")
+
+        messages.append(
+            "Review the changes and make sure they are as expected. Edit the files again if necessary."
+        )
+        return CLIResult(output="\n".join(messages))
+
     async def insert(
         self,
         path: PathLike,
@@ -346,10 +504,9 @@ class StrReplaceEditor(BaseTool):
     ) -> CLIResult:
         """Insert text at a specific line in a file."""
         # Read and prepare content
-        file_text = (await operator.read_file(path)).expandtabs()
-        new_str = new_str.expandtabs()
-        file_text_lines = file_text.split("\n")
-        n_lines_file = len(file_text_lines)
+        file_text = _expand_tabs(await operator.read_file(path))
+        new_str = _expand_tabs(new_str)
+        n_lines_file = file_text.count("\n") + 1
 
         # Validate insert_line
         if insert_line < 0 or insert_line > n_lines_file:
@@ -358,27 +515,29 @@ class StrReplaceEditor(BaseTool):
                 f"the range of lines of the file: {[0, n_lines_file]}"
             )
 
-        # Perform insertion
-        new_str_lines = new_str.split("\n")
-        new_file_text_lines = (
-            file_text_lines[:insert_line]
-            + new_str_lines
-            + file_text_lines[insert_line:]
-        )
-
-        # Create a snippet for preview
-        snippet_lines = (
-            file_text_lines[max(0, insert_line - SNIPPET_LINES) : insert_line]
-            + new_str_lines
-            + file_text_lines[insert_line : insert_line + SNIPPET_LINES]
-        )
-
-        # Join lines and write to file
-        new_file_text = "\n".join(new_file_text_lines)
-        snippet = "\n".join(snippet_lines)
+        # Splice new_str in after the end of line `insert_line`
+        cut = _nth_newline_offset(file_text, insert_line) if insert_line else 0
+        head, tail = file_text[:cut], file_text[cut:]
+        if insert_line == 0:
+            inserted = new_str + "\n"
+        else:
+            inserted = "\n" + new_str
+        new_file_text = head + inserted + tail
+
+        # Create a snippet for preview from up to SNIPPET_LINES lines either side
+        snippet = new_str
+        if insert_line > 0:
+            start = insert_line - SNIPPET_LINES
+            start = _nth_newline_offset(head, start) + 1 if start > 0 else 0
+            snippet = head[start:] + "\n" + snippet
+        if insert_line == 0:
+            snippet += "\n" + tail[: _nth_newline_offset(tail, SNIPPET_LINES)]
+        elif insert_line < n_lines_file:
+            # tail starts with the newline ending line `insert_line`
+            snippet += tail[: _nth_newline_offset(tail, SNIPPET_LINES + 1)]
 
         await operator.write_file(path, new_file_text)
-        self._file_history[path].append(file_text)
+        self._file_history[path].append(_ReverseEdit(cut, inserted, ""))
 
         # Prepare success message
         success_msg = f"The file {path} has been edited. "
@@ -398,8 +557,19 @@ class StrReplaceEditor(BaseTool):
         if not self._file_history[path]:
             raise ToolError(f"No edit history found for {path}.")
 
-        old_text = self._file_history[path].pop()
+        edit = self._file_history[path][-1]
+        if edit.inserted is None:
+            old_text = edit.removed
+        else:
+            text = await operator.read_file(path)
+            end = edit.offset + len(edit.inserted)
+            if text[edit.offset : end] != edit.inserted:
+                raise ToolError(
+                    f"Cannot undo the last edit to {path}: the file has changed since."
+                )
+            old_text = text[: edit.offset] + edit.removed + text[end:]
         await operator.write_file(path, old_text)
+        self._file_history[path].pop()
 
         return CLIResult(
             output=f"Last edit to {path} undone successfully. {self._make_output(old_text, str(path))}"
@@ -415,7 +585,7 @@ class StrReplaceEditor(BaseTool):
         """Format file content for display with line numbers."""
         file_content = maybe_truncate(file_content)
         if expand_tabs:
-            file_content = file_content.expandtabs()
+            file_content = _expand_tabs(file_content)
 
         # Add line numbers to each line
         file_content = "\n".join(
@@ -1,9 +1,9 @@
 import asyncio
-from typing import Any, Dict, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Type
 
 import requests
 from bs4 import BeautifulSoup
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.config import config
@@ -123,9 +123,9 @@ class WebContentFetcher:
         }
 
         try:
-            # Use asyncio to run requests in a thread pool
-            response = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: requests.get(url, headers=headers, timeout=timeout)
+            # Run the blocking request in a worker thread
+            response = await asyncio.to_thread(
+                requests.get, url, headers=headers, timeout=timeout
             )
 
             if response.status_code != 200:
@@ -190,13 +190,18 @@ class WebSearch(BaseTool):
         },
         "required": ["query"],
     }
-    _search_engine: dict[str, WebSearchEngine] = {
-        "google": GoogleSearchEngine(),
-        "baidu": BaiduSearchEngine(),
-        "duckduckgo": DuckDuckGoSearchEngine(),
-        "bing": BingSearchEngine(),
+    _search_engine: ClassVar[dict[str, Type[WebSearchEngine]]] = {
+        "google": GoogleSearchEngine,
+        "baidu": BaiduSearchEngine,
+        "duckduckgo": DuckDuckGoSearchEngine,
+        "bing": BingSearchEngine,
     }
+    # Engines are created on first use and shared by every WebSearch, along
+    # with their result caches.
+    _engines: ClassVar[dict[str, WebSearchEngine]] = {}
     content_fetcher: WebContentFetcher = WebContentFetcher()
+    # (search config it was computed from, engine order)
+    _engine_order: Optional[Tuple[Any, List[str]]] = PrivateAttr(default=None)
 
     async def execute(
         self,
@@ -295,7 +300,7 @@ class WebSearch(BaseTool):
         failed_engines = []
 
         for engine_name in engine_order:
-            engine = self._search_engine[engine_name]
+            engine = self._get_engine(engine_name)
             logger.info(f"🔎 Attempting search with {engine_name.capitalize()}...")
             search_items = await self._perform_search_with_engine(
                 engine, query, num_results, search_params
@@ -357,17 +362,31 @@ class WebSearch(BaseTool):
                 result.raw_content = content
         return result
 
+    @classmethod
+    def _get_engine(cls, name: str) -> WebSearchEngine:
+        """Return the shared engine for name, creating it on first use."""
+        engine = cls._engines.get(name)
+        if engine is None:
+            engine = cls._engines[name] = cls._search_engine[name]()
+        return engine
+
     def _get_engine_order(self) -> List[str]:
-        """Determines the order in which to try search engines."""
+        """Determines the order in which to try search engines.
+
+        Computed once per search config and reused until the config changes.
+        """
+        search_config = config.search_config
+        if self._engine_order and self._engine_order[0] is search_config:
+            return self._engine_order[1]
+
         preferred = (
-            getattr(config.search_config, "engine", "google").lower()
-            if config.search_config
+            getattr(search_config, "engine", "google").lower()
+            if search_config
             else "google"
         )
         fallbacks = (
-            [engine.lower() for engine in config.search_config.fallback_engines]
-            if config.search_config
-            and hasattr(config.search_config, "fallback_engines")
+            [engine.lower() for engine in search_config.fallback_engines]
+            if search_config and hasattr(search_config, "fallback_engines")
             else []
         )
 
@@ -382,6 +401,7 @@ class WebSearch(BaseTool):
         )
         engine_order.extend([e for e in self._search_engine if e not in engine_order])
 
+        self._engine_order = (search_config, engine_order)
         return engine_order
 
     @retry(
@@ -395,16 +415,11 @@ class WebSearch(BaseTool):
         search_params: Dict[str, Any],
     ) -> List[SearchItem]:
         """Execute search with the given engine and parameters."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: list(
-                engine.perform_search(
-                    query,
-                    num_results=num_results,
-                    lang=search_params.get("lang"),
-                    country=search_params.get("country"),
-                )
-            ),
+        return await engine.perform_search(
+            query,
+            num_results=num_results,
+            lang=search_params.get("lang"),
+            country=search_params.get("country"),
         )
 
 
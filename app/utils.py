@@ -0,0 +1,30 @@
+import asyncio
+import sys
+
+
+async def ainput(prompt: str = "") -> str:
+    """input() that leaves the event loop free while the user types.
+
+    Waits for stdin to become readable on the loop itself rather than in
+    asyncio.to_thread: an executor thread still blocked in input() after
+    Ctrl+C would hold up interpreter exit until Enter was pressed.
+    """
+    loop = asyncio.get_running_loop()
+    ready = loop.create_future()
+    try:
+        loop.add_reader(
+            sys.stdin.fileno(), lambda: ready.done() or ready.set_result(None)
+        )
+    except (AttributeError, NotImplementedError, OSError, ValueError):
+        # No selectable stdin (Windows console, regular file, ...)
+        return await asyncio.to_thread(input, prompt)
+
+    try:
+        print(prompt, end="", flush=True)
+        await ready
+    finally:
+        loop.remove_reader(sys.stdin.fileno())
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError("EOF when reading a line")
+    return line[:-1] if line.endswith("\n") else line
@@ -2,13 +2,21 @@ import asyncio
 
 from app.agent.manus import Manus
 from app.logger import logger
+from app.utils import ainput
+
+
+try:
+    import uvloop  # faster event loop, where available
+except ImportError:
+    uvloop = None
 
 
 async def main():
-    # Create and initialize Manus agent
-    agent = await Manus.create()
+    # Create and initialize Manus agent while the user types the prompt
+    agent_task = asyncio.create_task(Manus.create())
     try:
-        prompt = input("Enter your prompt: ")
+        prompt = await ainput("Enter your prompt: ")
+        agent = await agent_task
         if not prompt.strip():
             logger.warning("Empty prompt provided.")
             return
@@ -19,9 +27,13 @@ async def main():
     except KeyboardInterrupt:
         logger.warning("Operation interrupted.")
     finally:
-        # Ensure agent resources are cleaned up before exiting
-        await agent.cleanup()
+        # Ensure agent resources are cleaned up before exiting; if setup has
+        # not finished (e.g. cancelled at the prompt) don't wait for it
+        if not agent_task.done():
+            agent_task.cancel()
+        elif not agent_task.cancelled() and agent_task.exception() is None:
+            await agent_task.result().cleanup()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(main(), loop_factory=uvloop.new_event_loop if uvloop else None)
@@ -4,6 +4,13 @@ import time
 from app.agent.manus import Manus
 from app.flow.flow_factory import FlowFactory, FlowType
 from app.logger import logger
+from app.utils import ainput
+
+
+try:
+    import uvloop  # faster event loop, where available
+except ImportError:
+    uvloop = None
 
 
 async def run_flow():
@@ -12,7 +19,7 @@ async def run_flow():
     }
 
     try:
-        prompt = input("Enter your prompt: ")
+        prompt = await ainput("Enter your prompt: ")
 
         if prompt.strip().isspace() or not prompt:
             logger.warning("Empty prompt provided.")
@@ -25,13 +32,13 @@ async def run_flow():
         logger.warning("Processing your request...")
 
         try:
-            start_time = time.time()
-            result = await asyncio.wait_for(
-                flow.execute(prompt),
-                timeout=3600,  # 60 minute timeout for the entire execution
-            )
-            elapsed_time = time.time() - start_time
-            logger.info(f"Request processed in {elapsed_time:.2f} seconds")
+            start_time = time.perf_counter()
+            # 60 minute timeout for the entire execution
+            async with asyncio.timeout(3600):
+                result = await flow.execute(prompt)
+            elapsed_time = time.perf_counter() - start_time
+            # loguru only formats the arguments if the record is emitted
+            logger.info("Request processed in {:.2f} seconds", elapsed_time)
             logger.info(result)
         except asyncio.TimeoutError:
             logger.error("Request processing timed out after 1 hour")
@@ -46,4 +53,4 @@ async def run_flow():
 
 
 if __name__ == "__main__":
-    asyncio.run(run_flow())
+    asyncio.run(run_flow(), loop_factory=uvloop.new_event_loop if uvloop else None)
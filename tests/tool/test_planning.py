@@ -0,0 +1,172 @@
+import pytest
+
+from app.exceptions import ToolError
+from app.tool.planning import PlanningTool
+
+
+@pytest.fixture(scope="function")
+def planning_tool() -> PlanningTool:
+    """Creates a planning tool with no plans."""
+    return PlanningTool()
+
+
+async def _create(tool: PlanningTool, plan_id: str = "p1", steps=None):
+    return await tool.execute(
+        command="create",
+        plan_id=plan_id,
+        title=f"Plan {plan_id}",
+        steps=steps or ["first", "second", "third"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_sets_active_plan(planning_tool: PlanningTool):
+    """Tests that create stores the plan and makes it active."""
+    result = await _create(planning_tool)
+
+    assert "Plan created successfully with ID: p1" in result.output
+    assert "Progress: 0/3 steps completed (0.0%)" in result.output
+    assert "0 completed, 0 in progress, 0 blocked, 3 not started" in result.output
+
+    with pytest.raises(ToolError, match="already exists"):
+        await _create(planning_tool)
+
+
+@pytest.mark.asyncio
+async def test_create_validates_arguments(planning_tool: PlanningTool):
+    """Tests that create rejects a missing id, title or steps."""
+    with pytest.raises(ToolError, match="plan_id"):
+        await planning_tool.execute(command="create", title="t", steps=["a"])
+    with pytest.raises(ToolError, match="title"):
+        await planning_tool.execute(command="create", plan_id="p", steps=["a"])
+    with pytest.raises(ToolError, match="steps"):
+        await planning_tool.execute(command="create", plan_id="p", title="t")
+
+
+@pytest.mark.asyncio
+async def test_mark_step_updates_counts(planning_tool: PlanningTool):
+    """Tests that mark_step changes the status, notes and progress counts."""
+    await _create(planning_tool)
+
+    await planning_tool.execute(
+        command="mark_step", step_index=0, step_status="completed"
+    )
+    result = await planning_tool.execute(
+        command="mark_step",
+        plan_id="p1",
+        step_index=1,
+        step_status="in_progress",
+        step_notes="halfway",
+    )
+
+    assert "Progress: 1/3 steps completed (33.3%)" in result.output
+    assert "1 completed, 1 in progress, 0 blocked, 1 not started" in result.output
+    assert "0. [✓] first" in result.output
+    assert "1. [→] second" in result.output
+    assert "Notes: halfway" in result.output
+
+    with pytest.raises(ToolError, match="Invalid step_index"):
+        await planning_tool.execute(command="mark_step", step_index=3)
+    with pytest.raises(ToolError, match="Invalid step_status"):
+        await planning_tool.execute(
+            command="mark_step", step_index=0, step_status="done"
+        )
+
+
+@pytest.mark.asyncio
+async def test_update_keeps_unchanged_steps(planning_tool: PlanningTool):
+    """Tests that update keeps the status of unchanged steps only."""
+    await _create(planning_tool)
+    await planning_tool.execute(
+        command="mark_step", step_index=0, step_status="completed"
+    )
+    await planning_tool.execute(
+        command="mark_step", step_index=1, step_status="blocked"
+    )
+
+    result = await planning_tool.execute(
+        command="update",
+        plan_id="p1",
+        title="Renamed",
+        steps=["first", "changed", "third", "fourth"],
+    )
+
+    assert "Plan: Renamed (ID: p1)" in result.output
+    assert "1 completed, 0 in progress, 0 blocked, 3 not started" in result.output
+    assert "1. [ ] changed" in result.output
+    assert "3. [ ] fourth" in result.output
+
+
+@pytest.mark.asyncio
+async def test_list_get_and_set_active(planning_tool: PlanningTool):
+    """Tests listing plans, reading one and switching the active plan."""
+    result = await planning_tool.execute(command="list")
+    assert "No plans available" in result.output
+
+    await _create(planning_tool, "p1")
+    await _create(planning_tool, "p2", ["only"])
+    await planning_tool.execute(
+        command="mark_step", step_index=0, step_status="completed"
+    )
+
+    result = await planning_tool.execute(command="list")
+    assert "• p1: Plan p1 - 0/3 steps completed" in result.output
+    assert "• p2 (active): Plan p2 - 1/1 steps completed" in result.output
+
+    result = await planning_tool.execute(command="set_active", plan_id="p1")
+    assert "Plan 'p1' is now the active plan." in result.output
+
+    result = await planning_tool.execute(command="get")
+    assert "Plan: Plan p1 (ID: p1)" in result.output
+
+    with pytest.raises(ToolError, match="No plan found"):
+        await planning_tool.execute(command="get", plan_id="missing")
+    with pytest.raises(ToolError, match="No plan found"):
+        await planning_tool.execute(command="set_active", plan_id="missing")
+
+
+@pytest.mark.asyncio
+async def test_delete_clears_active_plan(planning_tool: PlanningTool):
+    """Tests that delete removes the plan and clears it as the active plan."""
+    await _create(planning_tool)
+    await planning_tool.execute(
+        command="mark_step", step_index=0, step_status="completed"
+    )
+
+    result = await planning_tool.execute(command="delete", plan_id="p1")
+    assert result.output == "Plan 'p1' has been deleted."
+
+    result = await planning_tool.execute(command="list")
+    assert "No plans available" in result.output
+    with pytest.raises(ToolError, match="No active plan"):
+        await planning_tool.execute(command="get")
+    with pytest.raises(ToolError, match="No plan found"):
+        await planning_tool.execute(command="delete", plan_id="p1")
+
+
+@pytest.mark.asyncio
+async def test_unknown_command(planning_tool: PlanningTool):
+    """Tests that an unknown command is rejected."""
+    with pytest.raises(ToolError, match="Unrecognized command"):
+        await planning_tool.execute(command="archive")
+
+
+@pytest.mark.asyncio
+async def test_counts_follow_direct_status_edits(planning_tool: PlanningTool):
+    """Tests that statuses edited outside the tool (as PlanningFlow does) show up."""
+    await _create(planning_tool)
+    await planning_tool.execute(command="get")
+
+    statuses = planning_tool.plans["p1"]["step_statuses"]
+    statuses[0] = "completed"
+    statuses.append("in_progress")
+    planning_tool.plans["p1"]["steps"].append("fourth")
+    planning_tool.plans["p1"]["step_notes"].append("")
+
+    result = await planning_tool.execute(command="get")
+    assert "1 completed, 1 in progress, 0 blocked, 2 not started" in result.output
+
+    result = await planning_tool.execute(
+        command="mark_step", step_index=3, step_status="completed"
+    )
+    assert "2 completed, 0 in progress, 0 blocked, 2 not started" in result.output
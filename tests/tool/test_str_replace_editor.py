@@ -0,0 +1,139 @@
+from pathlib import Path
+
+import pytest
+
+from app.exceptions import ToolError
+from app.tool.str_replace_editor import StrReplaceEditor
+
+
+@pytest.fixture(scope="function")
+def editor() -> StrReplaceEditor:
+    """Creates an editor with no edit history."""
+    return StrReplaceEditor()
+
+
+@pytest.fixture(scope="function")
+def files(tmp_path: Path) -> tuple[Path, Path]:
+    """Creates two small files to edit."""
+    first = tmp_path / "first.py"
+    second = tmp_path / "second.py"
+    first.write_text("alpha = 1\nbeta = 2\ngamma = 3\n")
+    second.write_text("delta = 4\n")
+    return first, second
+
+
+@pytest.mark.asyncio
+async def test_batch_applies_edits_across_files(
+    editor: StrReplaceEditor, files: tuple[Path, Path]
+):
+    """Tests that a batch applies every edit, in order, across files."""
+    first, second = files
+
+    result = await editor.execute(
+        command="str_replace_batch",
+        path=str(first),
+        edits=[
+            {"old_str": "alpha = 1", "new_str": "alpha = 10"},
+            {"old_str": "alpha = 10\nbeta", "new_str": "alpha = 11\nbeta"},
+            {"old_str": "gamma = 3\n"},
+            {"old_str": "delta", "new_str": "epsilon", "path": str(second)},
+        ],
+    )
+
+    assert f"The file {first} has been edited (3 replacements)." in result
+    assert f"The file {second} has been edited (1 replacement)." in result
+    assert first.read_text() == "alpha = 11\nbeta = 2\n"
+    assert second.read_text() == "epsilon = 4\n"
+
+
+@pytest.mark.asyncio
+async def test_batch_merges_spellings_of_one_file(
+    editor: StrReplaceEditor, files: tuple[Path, Path]
+):
+    """Tests that edits naming one file two ways are applied together."""
+    first, _ = files
+    other_spelling = str(first.parent) + "//" + first.name
+
+    result = await editor.execute(
+        command="str_replace_batch",
+        path=str(first),
+        edits=[
+            {"old_str": "alpha = 1", "new_str": "alpha = 10"},
+            {"old_str": "beta = 2", "new_str": "beta = 20", "path": other_spelling},
+        ],
+    )
+
+    assert "(2 replacements)" in result
+    assert first.read_text() == "alpha = 10\nbeta = 20\ngamma = 3\n"
+
+
+@pytest.mark.asyncio
+async def test_batch_undo_reverts_each_file(
+    editor: StrReplaceEditor, files: tuple[Path, Path]
+):
+    """Tests that undo_edit reverts a whole batch, one file at a time."""
+    first, second = files
+    original_first, original_second = first.read_text(), second.read_text()
+
+    await editor.execute(
+        command="str_replace_batch",
+        path=str(first),
+        edits=[
+            {"old_str": "alpha", "new_str": "ALPHA"},
+            {"old_str": "gamma", "new_str": "GAMMA"},
+            {"old_str": "delta", "new_str": "DELTA", "path": str(second)},
+        ],
+    )
+
+    result = await editor.execute(command="undo_edit", path=str(first))
+    assert f"Last edit to {first} undone successfully." in result
+    assert first.read_text() == original_first
+    assert second.read_text() == "DELTA = 4\n"
+
+    await editor.execute(command="undo_edit", path=str(second))
+    assert second.read_text() == original_second
+
+    with pytest.raises(ToolError, match="No edit history"):
+        await editor.execute(command="undo_edit", path=str(first))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "bad_edit, message",
+    [
+        ({"old_str": "missing"}, "did not appear verbatim"),
+        ({"old_str": " = "}, "Multiple occurrences"),
+        ({"new_str": "x"}, "requires `old_str`"),
+        ({"old_str": "x", "path": "relative.py"}, "not an absolute path"),
+    ],
+)
+async def test_batch_failure_changes_nothing(
+    editor: StrReplaceEditor, files: tuple[Path, Path], bad_edit: dict, message: str
+):
+    """Tests that one failing edit leaves every file of the batch untouched."""
+    first, second = files
+    original_first, original_second = first.read_text(), second.read_text()
+
+    with pytest.raises(ToolError, match=message):
+        await editor.execute(
+            command="str_replace_batch",
+            path=str(second),
+            edits=[
+                {"old_str": "delta", "new_str": "DELTA"},
+                {"path": str(first), **bad_edit},
+            ],
+        )
+
+    assert first.read_text() == original_first
+    assert second.read_text() == original_second
+    with pytest.raises(ToolError, match="No edit history"):
+        await editor.execute(command="undo_edit", path=str(second))
+
+
+@pytest.mark.asyncio
+async def test_batch_requires_edits(editor: StrReplaceEditor, files: tuple[Path, Path]):
+    """Tests that a batch without edits is rejected."""
+    first, _ = files
+
+    with pytest.raises(ToolError, match="`edits` is required"):
+        await editor.execute(command="str_replace_batch", path=str(first), edits=[])